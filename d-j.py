@@ -113,6 +113,20 @@ def initialize():
     if len(sys.argv) != 2 or str((sys.argv)[1]) == "-h" or str((sys.argv)[1]) == "--help" or not is_intstring(sys.argv[1]) or (int((sys.argv)[1]) != 0 and (int((sys.argv)[1]) != 1)):
         usage()
 
+    qc = build_circuit(random_oracle)  # Step 4 will implement our oracle randomly
+
+    #Plot the circuit
+    draw_circuit(qc)
+
+    #Return the circuit
+    return qc
+
+'''
+Build the circuit, without checking any argument nor plotting
+oracle_fn will receive the circuit and apply the oracle to it (step 4), e.g. random_oracle
+Also used by server.py, which chooses the oracle per request
+'''
+def build_circuit(oracle_fn):
     num_qubits = 2
     qc = q.QuantumCircuit(num_qubits,num_qubits) # Step 1
     qc.x(1)    # Step 2
@@ -120,17 +134,13 @@ def initialize():
     for i in range(num_qubits):
         qc.h(i)    # Step 3
     qc.barrier() # In order to visualize better
-    random_oracle(qc)  # Step 4, implement our oracle randomly
+    oracle_fn(qc)  # Step 4, implement our oracle
     qc.barrier() # In order to visualize better
     for i in range(num_qubits):
         qc.h(i) # Step 5
     qc.barrier() # In order to visualize better
     qc.measure([0,1],[0,1]) # Step 6, add measurements
 
-    #Plot the circuit
-    draw_circuit(qc)
-
-    #Return the circuit
     return qc
 
 '''
@@ -157,38 +167,46 @@ def random_oracle(qc):
 
 '''
 Constant oracle function
+verbose=False (used by server.py) does not print the oracle chosen
 '''
-def constant_oracle(n,qc):
+def constant_oracle(n,qc,verbose = True):
     if (n==0):  # Oracle for the case f(x) = 0. Notice we need nothing in this case, so "pass".
-        print ("Constant oracle chosen for f(x)=0")
+        if verbose:
+            print ("Constant oracle chosen for f(x)=0")
     else:  # Oracle for the case f(x) = 1. Invert y through the X-gate
         qc.x(1)
-        print ("Constant oracle chosen for f(x)=1")
+        if verbose:
+            print ("Constant oracle chosen for f(x)=1")
 
 '''
 Balanced oracle function
+verbose=False (used by server.py) does not print the oracle chosen
 '''
-def balanced_oracle(n,qc):
+def balanced_oracle(n,qc,verbose = True):
     if (n==0):  # This is the first part of the constant case. Hence a CNOT gate is needed
         qc.cx(0,1)
-        print ("Balanced oracle chosen for f(x)=x")
+        if verbose:
+            print ("Balanced oracle chosen for f(x)=x")
     else: # This is the second part of the constante case. X gate for x and then a CNOT.
         qc.x(0)
         qc.cx(0,1)
-        print ("Balanced oracle chosen for f(x)=not(x)")
+        if verbose:
+            print ("Balanced oracle chosen for f(x)=not(x)")
 
 '''
 Generate results from quantum simulator (no plotting)
 '''
-def results_qsim(qc):
-    backend = q.Aer.get_backend('qasm_simulator')
-    job = q.execute(qc, backend, shots = 1024)
+def results_qsim(qc, shots = 1024, backend = None):
+    #An already initialized backend can be reused (see server.py), otherwise get a new one
+    if backend is None:
+        backend = q.Aer.get_backend('qasm_simulator')
+    job = q.execute(qc, backend, shots = shots)
     return job
 
 '''
-Generate results from real quantum hardware (no plotting)
+Load the IBMQ account and return the provider
 '''
-def results_qhw(qc):
+def load_provider():
     '''
     #Only needed if credentials are not stored (e.g., deleted and regeneration is needed
     token='XXXXXXXX' #Use token from ibm quantum portal if needed to enable again, should be stored under ~/.qiskit directory
@@ -196,14 +214,26 @@ def results_qhw(qc):
     '''
     provider = q.IBMQ.load_account()
     provider = q.IBMQ.get_provider()
+    return provider
+
+'''
+Generate results from real quantum hardware (no plotting)
+An already loaded provider can be reused (see server.py), otherwise the account is loaded again
+verbose=False (used by server.py) neither prints the device nor monitors the job, job.result() will simply wait for it
+'''
+def results_qhw(qc, shots = 1024, provider = None, verbose = True):
+    if provider is None:
+        provider = load_provider()
     device = q.providers.ibmq.least_busy(provider.backends(filters=lambda x: x.configuration().n_qubits >= 3 and
                                        not x.configuration().simulator and x.status().operational==True))
-    print("Running on current least busy device: ", device)
+    if verbose:
+        print("Running on current least busy device: ", device)
 
     transpiled_circuit = q.transpile(qc, device, optimization_level=3)
-    qobj = q.assemble(transpiled_circuit)
+    qobj = q.assemble(transpiled_circuit, shots = shots)
     job = device.run(qobj)
-    q.tools.monitor.job_monitor(job, interval=2)
+    if verbose:
+        q.tools.monitor.job_monitor(job, interval=2)
 
     return job
 
@@ -216,6 +246,12 @@ def draw_job (job,title):
     plot_histogram(counts)
     plt.draw()
     plt.title(title)
+    print(solution(counts)) #Print the answer to our problem
+
+'''
+Get the answer to our problem from the counts of a job
+'''
+def solution(counts):
     #print(counts) #This outputs the results and the number of occurrences of each. It should yield only one possible solution for all 1024 cases
     if (len(counts) == 1):
         output=list(counts.keys())[0]
@@ -224,28 +260,29 @@ def draw_job (job,title):
         #print (output)
     #print (output)
     if(output=='00' or output=='10'): #Check for x (q0) being 0 for constant
-        solution='Oracle (and hence f(x)) is constant'
+        return 'Oracle (and hence f(x)) is constant'
     else: #Otherwise, balanced
-        solution='Oracle (and hence f(x)) is balanced'
-    print(solution) #Print the answer to our problem
-
-#Initliaze the quantum circuit for D-J algorithm
-dj_circuit = initialize()
-
-#Generate results in simulator
-job_sim = results_qsim(dj_circuit)
-#Plot these results
-draw_job(job_sim, "Quantum simulator output")
-
-if int(sys.argv[1]) == 1:
-    plt.show(block=False)
-    plt.draw()
-    #Next line needed for keeping computations in background while still seeing the previous plots
-    plt.pause(0.001)
-    #Generate results in real quantum hardware
-    job_qhw = results_qhw(dj_circuit)
-    #Plot these results as well
-    draw_job(job_qhw, "Quantum hardware output")
-
-#Keep plots active when done till they're closed, used for explanations during presentations
-plt.show()
+        return 'Oracle (and hence f(x)) is balanced'
+
+#Nothing below runs when imported as a module (e.g. by server.py)
+if __name__ == "__main__":
+    #Initliaze the quantum circuit for D-J algorithm
+    dj_circuit = initialize()
+
+    #Generate results in simulator
+    job_sim = results_qsim(dj_circuit)
+    #Plot these results
+    draw_job(job_sim, "Quantum simulator output")
+
+    if int(sys.argv[1]) == 1:
+        plt.show(block=False)
+        plt.draw()
+        #Next line needed for keeping computations in background while still seeing the previous plots
+        plt.pause(0.001)
+        #Generate results in real quantum hardware
+        job_qhw = results_qhw(dj_circuit)
+        #Plot these results as well
+        draw_job(job_qhw, "Quantum hardware output")
+
+    #Keep plots active when done till they're closed, used for explanations during presentations
+    plt.show()
@@ -360,6 +360,31 @@ def diffusion(qc):
 
     #qc.barrier()
 
+'''
+Build the whole circuit for the given bits to search for, without checking any argument nor plotting
+bits is an integer for a single solution, or a sorted list of two integers for 2 solutions (only for 3 qubits)
+iterations is only taken into account for 3 qubits and a single solution
+Used by server.py, it follows the same steps as the program below
+'''
+def build_circuit(num_qubits, bits, iterations = 2):
+    qc = q.QuantumCircuit(num_qubits)
+    #Apply a H-gate to all qubits in qc
+    for i in range(qc.num_qubits):
+        qc.h(i)
+    qc.barrier()
+    if num_qubits == 2:
+        oracle_2_qubits(qc,bits)
+        diffusion(qc)
+    elif isinstance(bits, list):
+        oracle_3_qubits_2_solutions(qc,bits)
+        diffusion(qc)
+    else:
+        for i in range(iterations):
+            oracle_3_qubits_single_solution(qc,bits)
+            diffusion(qc)
+    qc.measure_all()
+    return qc
+
 '''
 Add measurements and plot the quantum circuit:
 '''
@@ -372,15 +397,17 @@ def measure(qc):
 '''
 Generate results from quantum simulator (no plotting)
 '''
-def results_qsim(qc):
-    backend = q.Aer.get_backend('qasm_simulator')
-    job = q.execute(qc, backend, shots = 1024)
+def results_qsim(qc, shots = 1024, backend = None):
+    #An already initialized backend can be reused (see server.py), otherwise get a new one
+    if backend is None:
+        backend = q.Aer.get_backend('qasm_simulator')
+    job = q.execute(qc, backend, shots = shots)
     return job
 
 '''
-Generate results from real quantum hardware (no plotting)
+Load the IBMQ account and return the provider
 '''
-def results_qhw(qc):
+def load_provider():
     '''
     #Only needed if credentials are not stored (e.g., deleted and regeneration is needed
     token='XXXXXXXX' #Use token from ibm quantum portal if needed to enable again, should be stored under ~/.qiskit directory
@@ -388,14 +415,26 @@ def results_qhw(qc):
     '''
     provider = q.IBMQ.load_account()
     provider = q.IBMQ.get_provider()
+    return provider
+
+'''
+Generate results from real quantum hardware (no plotting)
+An already loaded provider can be reused (see server.py), otherwise the account is loaded again
+verbose=False (used by server.py) neither prints the device nor monitors the job, job.result() will simply wait for it
+'''
+def results_qhw(qc, shots = 1024, provider = None, verbose = True):
+    if provider is None:
+        provider = load_provider()
     device = q.providers.ibmq.least_busy(provider.backends(filters=lambda x: x.configuration().n_qubits >= 3 and
                                        not x.configuration().simulator and x.status().operational==True))
-    print("Running on current least busy device: ", device)
+    if verbose:
+        print("Running on current least busy device: ", device)
 
     transpiled_grover_circuit = q.transpile(qc, device, optimization_level=3)
-    qobj = q.assemble(transpiled_grover_circuit)
+    qobj = q.assemble(transpiled_grover_circuit, shots = shots)
     job = device.run(qobj)
-    q.tools.monitor.job_monitor(job, interval=2)
+    if verbose:
+        q.tools.monitor.job_monitor(job, interval=2)
 
     return job
 
@@ -417,28 +456,30 @@ def draw_job (job,title):
 #Program actually starts here!!#
 ################################
 
-#Initialization
-grover_circuit = initialize()
-#Generate the oracle randomly according to the command line arguments
-oracle(grover_circuit)
-#Diffusion
-if (not(int(sys.argv[1]) == 3 and int(sys.argv[2]) == 1)):
-    diffusion(grover_circuit)
-#Add measurements
-measure(grover_circuit)
-#Generate results in simulator
-job_sim = results_qsim(grover_circuit)
-#Plot these results
-draw_job(job_sim, "Quantum simulator output")
-#Generate results in quantum hw if requested
-if int(sys.argv[4]) == 1:
-    plt.show(block=False)
-    plt.draw()
-    #Next line needed for keeping computations in background while still seeing the previous plots
-    plt.pause(0.001)
-    #Generate results in real quantum hardware
-    job_qhw = results_qhw(grover_circuit)
-    #Plot these results as well
-    draw_job(job_qhw, "Quantum hardware output")
-#Keep plots active when done till they're closed, used for explanations during presentations
-plt.show()
+#Nothing below runs when imported as a module (e.g. by server.py)
+if __name__ == "__main__":
+    #Initialization
+    grover_circuit = initialize()
+    #Generate the oracle randomly according to the command line arguments
+    oracle(grover_circuit)
+    #Diffusion
+    if (not(int(sys.argv[1]) == 3 and int(sys.argv[2]) == 1)):
+        diffusion(grover_circuit)
+    #Add measurements
+    measure(grover_circuit)
+    #Generate results in simulator
+    job_sim = results_qsim(grover_circuit)
+    #Plot these results
+    draw_job(job_sim, "Quantum simulator output")
+    #Generate results in quantum hw if requested
+    if int(sys.argv[4]) == 1:
+        plt.show(block=False)
+        plt.draw()
+        #Next line needed for keeping computations in background while still seeing the previous plots
+        plt.pause(0.001)
+        #Generate results in real quantum hardware
+        job_qhw = results_qhw(grover_circuit)
+        #Plot these results as well
+        draw_job(job_qhw, "Quantum hardware output")
+    #Keep plots active when done till they're closed, used for explanations during presentations
+    plt.show()
@@ -0,0 +1,307 @@
+#!/usr/bin/python3
+
+'''
+ * Copyright (C) 2021 Raúl Osuna Sánchez-Infante
+ *
+ * This software may be modified and distributed under the terms
+ * of the MIT license.  See the LICENSE.txt file for details.
+'''
+##################
+#Needed libraries#
+##################
+
+import numpy as np
+import os
+import signal
+import sys
+import threading
+from math import asin, floor, pi, sin, sqrt
+from multiprocessing import Barrier, Process
+from multiprocessing.shared_memory import SharedMemory
+from threading import BrokenBarrierError
+from time import perf_counter
+
+'''
+Grover's algorithm with a statevector split across several processes
+
+grover.py builds the circuit and lets Aer simulate it, but a single simulation runs in a single process,
+which is limited by the memory bandwidth a single core can get. For a big number of qubits, this program
+simulates Grover's algorithm directly on the statevector instead, keeping the 2^n amplitudes in shared memory
+and giving a slice of them to each worker process.
+
+No quantum circuit is needed for this, as both steps of every iteration are easy to apply to the amplitudes:
+    Oracle: flip the sign of the amplitudes of the bits to search for. Every worker flips the ones in its slice
+    Diffusion (inversion about the mean): a -> 2·mean - a for every amplitude.
+        Every worker sums its slice, then waits for the rest (the mean is a global value), and updates its slice
+
+All amplitudes start equal (H gate on every qubit) and both steps keep them real, so a real (float64) array
+is enough: 8·2^n bytes, i.e. 8 GiB for n=30. It lives in /dev/shm, which must be big enough for it.
+
+Close to n=30, all the iterations (floor(pi/4 · sqrt(N/M)), e.g. 25735 for n=30 and M=1) take hours.
+So the scaling is measured by timing only a few iterations with 1, 2, 4... workers, up to the given number
+of processes, showing the time per iteration, the speedup, the scaling efficiency (speedup / number of workers)
+and the estimated time for all the iterations. Then the whole simulation is run only once, with all the workers,
+to check the probability of measuring a solution.
+'''
+
+#######################
+#Functions definitions#
+#######################
+
+'''
+Usage function
+calling the program with "-h" or "--help" will display the help without returning an error (help was intended)
+calling the progam with no options or wrong ones, will display the same help but returning an error
+'''
+def usage():
+    print("Usage: " + str((sys.argv)[0]) + " i j [k] [l]")
+    print("i: Number of qubits (2 or more, bear in mind 8·2^i bytes of memory will be needed in /dev/shm)")
+    print("j: Number of solutions, chosen randomly (between 1 and 2^(i-1))")
+    print("k: Maximum number of worker processes (number of CPUs if not given)")
+    print("l: Number of iterations timed for every number of workers (10 if not given, all of them if fewer)")
+    if len(sys.argv) == 2 and (str((sys.argv)[1]) == "-h" or str((sys.argv)[1]) == "--help"):
+        exit(0)
+    else:
+        exit(1)
+
+'''
+Check whether parameter is an integer
+'''
+def is_intstring(s):
+    try:
+        int(s)
+        return True
+    except ValueError:
+        return False
+
+'''
+Generate the bits to search for randomly, all of them different and sorted
+A numpy array is used, as there can be hundreds of millions of them for a big number of qubits
+'''
+def random_targets(num_qubits, num_solutions):
+    rng = np.random.default_rng()
+    bits = np.unique(rng.integers(0, 2**num_qubits, num_solutions, dtype=np.int64))
+    #Repeated bits were removed, generate more till there are enough
+    while len(bits) < num_solutions:
+        more = rng.integers(0, 2**num_qubits, num_solutions - len(bits), dtype=np.int64)
+        bits = np.unique(np.concatenate((bits, more)))
+    return bits
+
+'''
+Number of iterations for the highest probability: floor(pi/4 · sqrt(N/M))
+'''
+def num_iterations(num_qubits, num_solutions):
+    return floor(pi / 4 * sqrt(2**num_qubits / num_solutions))
+
+'''
+Theoretical probability of measuring any of the solutions after the given iterations: sin^2((2k+1)·theta)
+'''
+def theoretical_probability(num_qubits, num_solutions, iterations):
+    theta = asin(sqrt(num_solutions / 2**num_qubits))
+    return sin((2 * iterations + 1) * theta)**2
+
+'''
+Check there is enough room in /dev/shm (Linux) for the statevector
+Otherwise the workers would be killed (SIGBUS) when writing to it, not when creating it
+'''
+def check_shm(num_qubits):
+    if os.path.isdir("/dev/shm"):
+        stat = os.statvfs("/dev/shm")
+        free = stat.f_bavail * stat.f_frsize
+        if free < 8 * 2**num_qubits:
+            sys.exit("Not enough room in /dev/shm: " + str(8 * 2**num_qubits) + " bytes needed, " + str(free) + " available. Exit.")
+
+'''
+Worker process, runs every iteration on its own slice of the statevector
+local_targets are the bits to search for in its slice, already relative to the start of the slice
+Partial sums are written in two alternate rows, so that a single barrier per iteration is enough:
+a row is only written again once every worker has gone through the next barrier, i.e. after all of them read it
+clock is also waited for by the main process, right before and after all the iterations, to measure the time
+If any other worker dies, the main process aborts the barriers and this worker simply finishes
+'''
+def worker(state_name, partial_name, num_qubits, local_targets, iterations, w, workers, sync, clock):
+    N = 2**num_qubits
+    state_shm = SharedMemory(name=state_name)
+    partial_shm = SharedMemory(name=partial_name)
+    try:
+        run_slice(state_shm, partial_shm, N, local_targets, iterations, w, workers, sync, clock)
+    except BrokenBarrierError:
+        pass
+    finally:
+        state_shm.close()
+        partial_shm.close()
+
+'''
+Actual work of a worker process, kept apart so that no views of the shared memory are left when closing it
+'''
+def run_slice(state_shm, partial_shm, N, local_targets, iterations, w, workers, sync, clock):
+    state = np.ndarray((N,), dtype=np.float64, buffer=state_shm.buf)
+    partial = np.ndarray((2, workers), dtype=np.float64, buffer=partial_shm.buf)
+    local = state[w * N // workers:(w + 1) * N // workers]
+
+    #Initialization: H gate on every qubit, all amplitudes are equal
+    #Done by every worker on its own slice, so that its memory is also allocated close to it
+    local.fill(1 / sqrt(N))
+
+    clock.wait()
+    for i in range(iterations):
+        #Oracle: flip the sign of the solutions
+        local[local_targets] *= -1
+        #Diffusion: global mean first, then 2·mean - a locally
+        partial[i % 2, w] = local.sum()
+        sync.wait()
+        mean = partial[i % 2].sum() / N
+        np.subtract(2 * mean, local, out=local)
+    clock.wait()
+
+'''
+Watch the workers while the main process waits for them
+If any of them dies (e.g. SIGBUS when /dev/shm is full), abort both barriers, so that nobody waits forever
+'''
+def watch_workers(processes, barriers, done):
+    while not done.wait(0.5):
+        if any(p.exitcode is not None and p.exitcode != 0 for p in processes):
+            for barrier in barriers:
+                barrier.abort()
+            return
+
+'''
+Error message for the first worker that died
+'''
+def worker_error(processes):
+    for w, p in enumerate(processes):
+        if p.exitcode is not None and p.exitcode != 0:
+            if p.exitcode < 0:
+                reason = "killed by " + signal.Signals(-p.exitcode).name
+            else:
+                reason = "exit code " + str(p.exitcode)
+            if p.exitcode == -signal.SIGBUS:
+                reason += ", is /dev/shm big enough?"
+            return "Worker " + str(w) + " died (" + reason + ")"
+    return "Workers stopped unexpectedly"
+
+'''
+Probability of measuring any of the solutions, read from the statevector
+'''
+def read_probability(state_shm, N, targets):
+    state = np.ndarray((N,), dtype=np.float64, buffer=state_shm.buf)
+    return float(np.sum(state[targets]**2))
+
+'''
+Run the simulation with the given number of workers and iterations
+Returns the time spent in the iterations and the probability of measuring any of the solutions
+Raises RuntimeError if any of the workers died
+'''
+def simulate(num_qubits, targets, workers, iterations):
+    N = 2**num_qubits
+    blocks = []
+    processes = []
+    try:
+        state_shm = SharedMemory(create=True, size=8 * N)
+        blocks.append(state_shm)
+        partial_shm = SharedMemory(create=True, size=8 * 2 * workers)
+        blocks.append(partial_shm)
+        sync = Barrier(workers)
+        clock = Barrier(workers + 1)
+        for w in range(workers):
+            #Only the bits to search for in the slice of this worker are given to it
+            start = w * N // workers
+            end = (w + 1) * N // workers
+            local_targets = targets[np.searchsorted(targets, start):np.searchsorted(targets, end)] - start
+            processes.append(Process(target=worker, args=(state_shm.name, partial_shm.name, num_qubits, local_targets,
+                                                          iterations, w, workers, sync, clock)))
+        for p in processes:
+            p.start()
+
+        done = threading.Event()
+        watcher = threading.Thread(target=watch_workers, args=(processes, (sync, clock), done))
+        watcher.start()
+        try:
+            clock.wait()
+            t0 = perf_counter()
+            clock.wait()
+            elapsed = perf_counter() - t0
+        except BrokenBarrierError:
+            raise RuntimeError(worker_error(processes))
+        finally:
+            done.set()
+            watcher.join()
+        for p in processes:
+            p.join()
+
+        probability = read_probability(state_shm, N, targets)
+    finally:
+        for p in processes:
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return elapsed, probability
+
+'''
+Numbers of workers to compare: powers of 2 up to the maximum, and the maximum itself
+'''
+def workers_list(max_workers):
+    workers = [2**i for i in range(max_workers.bit_length()) if 2**i <= max_workers]
+    if workers[-1] != max_workers:
+        workers.append(max_workers)
+    return workers
+
+'''
+Time a few iterations for every number of workers and show the scaling efficiency
+Then run the whole simulation once, with all the workers, to check the probability
+'''
+def scaling(num_qubits, targets, max_workers, timed_iterations):
+    iterations = num_iterations(num_qubits, len(targets))
+    timed_iterations = min(timed_iterations, iterations)
+    print("Qubits: " + str(num_qubits) + ", iterations: " + str(iterations) + ", timed iterations: " + str(timed_iterations))
+    print("Workers  Time/iteration (s)  Speedup  Efficiency  Estimated total (s)")
+    t1 = None
+    for workers in workers_list(max_workers):
+        elapsed, probability = simulate(num_qubits, targets, workers, timed_iterations)
+        per_iteration = elapsed / timed_iterations
+        if t1 is None:
+            t1 = per_iteration
+        speedup = t1 / per_iteration
+        print("%7d  %18.6f  %7.2f  %10.2f  %19.1f" % (workers, per_iteration, speedup, speedup / workers, per_iteration * iterations))
+
+    print("Running all the iterations with " + str(max_workers) + " worker(s)")
+    elapsed, probability = simulate(num_qubits, targets, max_workers, iterations)
+    print("Time (s): %.3f" % elapsed)
+    print("Probability of measuring a solution: " + str(probability))
+    print("Theoretical probability of measuring a solution: " + str(theoretical_probability(num_qubits, len(targets), iterations)))
+
+##############################
+#End of functions definitions#
+##############################
+
+################################
+#Program actually starts here!!#
+################################
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or len(sys.argv) > 5 or str((sys.argv)[1]) == "-h" or str((sys.argv)[1]) == "--help":
+        usage()
+    for arg in sys.argv[1:]:
+        if not is_intstring(arg):
+            sys.exit("All arguments must be integers. Exit.")
+    num_qubits = int(sys.argv[1])
+    num_solutions = int(sys.argv[2])
+    max_workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    timed_iterations = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+    if num_qubits < 2 or num_solutions < 1 or num_solutions > 2**(num_qubits - 1) or max_workers < 1 or timed_iterations < 1:
+        usage()
+    check_shm(num_qubits)
+
+    targets = random_targets(num_qubits, num_solutions)
+    if len(targets) <= 10:
+        print("Random bits to search for are (decimal representation): " + ", ".join(str(t) for t in targets))
+    else:
+        print("Random bits to search for: " + str(len(targets)) + ", e.g. (decimal representation): " + ", ".join(str(t) for t in targets[:10]) + "...")
+    try:
+        scaling(num_qubits, targets, max_workers, timed_iterations)
+    except RuntimeError as e:
+        sys.exit(str(e) + ". Exit.")
@@ -0,0 +1,295 @@
+#!/usr/bin/python3
+
+'''
+ * Copyright (C) 2021 Raúl Osuna Sánchez-Infante
+ *
+ * This software may be modified and distributed under the terms
+ * of the MIT license.  See the LICENSE.txt file for details.
+'''
+##################
+#Needed libraries#
+##################
+
+import importlib.util
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Pool, TimeoutError as PoolTimeoutError
+from random import getrandbits
+
+'''
+Long-running server for d-j.py and grover.py
+
+Every run of d-j.py or grover.py starts a new interpreter, imports qiskit and matplotlib again,
+gets a new Aer backend and, for real hardware, loads the IBMQ account again. For small circuits
+like these, all of that takes much longer than the simulation itself.
+This program does all of that only once: it imports both programs as modules, and keeps a pool of
+worker processes with the simulator backend already loaded. Requests are sent to it over HTTP, on
+localhost only, and simulator requests are queued across the pool.
+Requests for real quantum hardware only wait for the IBMQ queue, which can take hours, so they are not
+sent to the pool (they would leave no workers for the simulator). They are run in the thread handling
+the request instead, with the IBMQ provider loaded only once (the first time it is needed).
+
+Request: POST /run with a JSON body such as
+    {"algorithm": "grover", "n": 3, "targets": [2, 5], "shots": 1024}
+    {"algorithm": "grover", "n": 3, "targets": [6], "iterations": 1, "hardware": 1}
+    {"algorithm": "d-j", "oracle": "balanced", "variant": 1}
+    algorithm: "d-j" or "grover"
+    n: number of qubits. 2 or 3 for grover, can only be 2 for d-j (optional in that case)
+    targets: (grover only) list of bits to search for (decimal representation). 1 element for n=2, 1 or 2 for n=3. Random if not given
+    iterations: (grover only) 1 or 2, only taken into account for n=3 and a single target. 2 if not given
+    oracle, variant: (d-j only) "constant" or "balanced", and 0 or 1 (see d-j.py). Random if not given
+    shots: 1024 if not given
+    hardware: 0 (quantum simulator, default) or 1 (real quantum hardware)
+Answer: JSON with the counts, plus the targets or the oracle chosen (and the answer to the problem for d-j)
+
+Simulator requests get a 504 error if they take more than 5 minutes, waiting in the queue included.
+
+GET /status will show the number of workers and requests still waiting or running
+'''
+
+####################################
+#Programs to be imported as modules#
+####################################
+
+'''
+Import one of the programs from this same directory as a module
+importlib is needed as "d-j" is not a valid module name
+'''
+def load_program(filename, name):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+#Imported here, so that qiskit and matplotlib get imported only once, before the workers are created
+dj = load_program("d-j.py", "dj")
+grover = load_program("grover.py", "grover")
+
+#Per worker process: simulator backend, initialized only once
+backend_sim = None
+#Server process only: IBMQ provider, loaded only once by the first request for real quantum hardware
+provider = None
+provider_lock = threading.Lock()
+
+#Seconds a simulator request may take, waiting in the queue included
+#Without it, a request whose worker died (e.g. killed for using too much memory) would wait forever
+timeout = 300
+
+#######################
+#Functions definitions#
+#######################
+
+'''
+Usage function
+calling the program with "-h" or "--help" will display the help without returning an error (help was intended)
+calling the progam with wrong options, will display the same help but returning an error
+'''
+def usage():
+    print("Usage: " + str((sys.argv)[0]) + " [i] [j]")
+    print("i: Port to listen to on localhost (8000 if not given)")
+    print("j: Number of worker processes (number of CPUs if not given)")
+    if len(sys.argv) == 2 and (str((sys.argv)[1]) == "-h" or str((sys.argv)[1]) == "--help"):
+        exit(0)
+    else:
+        exit(1)
+
+'''
+Initialization of every worker process: get the simulator backend only once
+'''
+def init_worker():
+    global backend_sim
+    backend_sim = dj.q.Aer.get_backend('qasm_simulator')
+
+'''
+Check whether a value from the JSON request is an actual integer
+Floats such as 2.0 and booleans (True == 1 in Python) are not
+'''
+def is_int(x):
+    return isinstance(x, int) and not isinstance(x, bool)
+
+'''
+Check a request and fill in the missing (random or default) values
+Returns the request to be run, raises ValueError if it is wrong
+'''
+def check_request(request):
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+    algorithm = request.get("algorithm")
+    shots = request.get("shots", 1024)
+    hardware = request.get("hardware", 0)
+    if not is_int(shots) or shots < 1:
+        raise ValueError("shots must be a positive integer")
+    if not is_int(hardware) or (hardware != 0 and hardware != 1):
+        raise ValueError("hardware can only be 0 or 1")
+    run = {"algorithm": algorithm, "shots": shots, "hardware": hardware}
+
+    if algorithm == "d-j":
+        n = request.get("n", 2)
+        if not is_int(n) or n != 2:
+            raise ValueError("n can only be 2 for d-j")
+        oracle = request.get("oracle", ["constant", "balanced"][getrandbits(1)])
+        variant = request.get("variant", getrandbits(1))
+        if oracle != "constant" and oracle != "balanced":
+            raise ValueError("oracle can only be constant or balanced")
+        if not is_int(variant) or (variant != 0 and variant != 1):
+            raise ValueError("variant can only be 0 or 1")
+        run.update({"n": 2, "oracle": oracle, "variant": variant})
+    elif algorithm == "grover":
+        n = request.get("n")
+        if not is_int(n) or (n != 2 and n != 3):
+            raise ValueError("n can only be 2 or 3 for grover")
+        targets = request.get("targets", [getrandbits(n)])
+        if not isinstance(targets, list) or not all(is_int(t) and 0 <= t < 2**n for t in targets):
+            raise ValueError("targets must be a list of integers between 0 and " + str(2**n - 1))
+        if len(targets) != 1 and (n == 2 or len(targets) != 2 or targets[0] == targets[1]):
+            raise ValueError("targets can only have 1 element for n=2, or 1 or 2 different elements for n=3")
+        iterations = request.get("iterations", 2)
+        if not is_int(iterations) or (iterations != 1 and iterations != 2):
+            raise ValueError("iterations can only be 1 or 2")
+        run.update({"n": n, "targets": sorted(targets), "iterations": iterations})
+    else:
+        raise ValueError("algorithm can only be d-j or grover")
+
+    return run
+
+'''
+Build the circuit for a (checked) request, without printing anything
+Returns the circuit and the program (module) it belongs to
+'''
+def build_circuit(run):
+    if run["algorithm"] == "d-j":
+        if run["oracle"] == "constant":
+            qc = dj.build_circuit(lambda qc: dj.constant_oracle(run["variant"], qc, False))
+        else:
+            qc = dj.build_circuit(lambda qc: dj.balanced_oracle(run["variant"], qc, False))
+        return qc, dj
+    else:
+        targets = run["targets"]
+        bits = targets[0] if len(targets) == 1 else targets
+        return grover.build_circuit(run["n"], bits, run["iterations"]), grover
+
+'''
+Answer to a request, once its job is done
+'''
+def job_answer(run, job):
+    answer = dict(run)
+    answer["counts"] = job.result().get_counts()
+    if run["algorithm"] == "d-j":
+        answer["solution"] = dj.solution(answer["counts"])
+    return answer
+
+'''
+Run a (checked) request in the quantum simulator, in a worker process
+The simulator backend is already there
+'''
+def run_simulator(run):
+    qc, program = build_circuit(run)
+    job = program.results_qsim(qc, run["shots"], backend_sim)
+    return job_answer(run, job)
+
+'''
+Run a (checked) request in real quantum hardware, in the server process
+The provider is loaded the first time it is needed, and shared by all the requests after that
+'''
+def run_hardware(run):
+    global provider
+    qc, program = build_circuit(run)
+    with provider_lock:
+        if provider is None:
+            provider = program.load_provider()
+    job = program.results_qhw(qc, run["shots"], provider, False)
+    return job_answer(run, job)
+
+'''
+HTTP requests handler
+Every request is handled in its own thread, which waits for the worker pool to run it
+(or for the real quantum hardware)
+'''
+class Handler(BaseHTTPRequestHandler):
+    def send_json(self, code, content):
+        body = json.dumps(content).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/status":
+            self.send_json(404, {"error": "Unknown path, use GET /status or POST /run"})
+            return
+        with self.server.lock:
+            pending = self.server.pending
+        self.send_json(200, {"workers": self.server.workers, "pending": pending})
+
+    def do_POST(self):
+        if self.path != "/run":
+            self.send_json(404, {"error": "Unknown path, use GET /status or POST /run"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            #A negative length would make read() wait till the client closes the connection
+            if length < 0:
+                raise ValueError("Content-Length can not be negative")
+            run = check_request(json.loads(self.rfile.read(length) or b"{}"))
+        except ValueError as e: #Also raised for wrong JSON
+            self.send_json(400, {"error": str(e)})
+            return
+
+        with self.server.lock:
+            self.server.pending += 1
+        try:
+            if run["hardware"] == 1:
+                answer = run_hardware(run)
+            else:
+                answer = self.server.pool.apply_async(run_simulator, (run,)).get(timeout)
+        except PoolTimeoutError:
+            self.send_json(504, {"error": "No answer after " + str(timeout) + " seconds"})
+            return
+        except Exception as e:
+            self.send_json(500, {"error": str(e)})
+            return
+        finally:
+            with self.server.lock:
+                self.server.pending -= 1
+        self.send_json(200, answer)
+
+'''
+Create the worker pool and serve requests till interrupted (e.g. Ctrl+C)
+'''
+def serve(port, workers):
+    with Pool(workers, initializer=init_worker) as pool:
+        server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        server.pool = pool
+        server.workers = workers
+        server.lock = threading.Lock()
+        server.pending = 0
+        print("Listening on http://127.0.0.1:" + str(port) + " with " + str(workers) + " worker(s)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("Exiting")
+        finally:
+            server.server_close()
+
+##############################
+#End of functions definitions#
+##############################
+
+################################
+#Program actually starts here!!#
+################################
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3 or (len(sys.argv) > 1 and (str((sys.argv)[1]) == "-h" or str((sys.argv)[1]) == "--help")):
+        usage()
+    for arg in sys.argv[1:]:
+        if not dj.is_intstring(arg) or int(arg) < 1:
+            usage()
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+    serve(port, workers)